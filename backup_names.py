@@ -1,30 +1,41 @@
 # backup cyle names
-import json
+import os
 
+import json_stream
 
-def backup_cycles():
-    with open("data/pushjerk_cycles.json", "r") as f:
-        data = json.load(f)
-
-    names = {d["cycle_id"]: d["name"] for d in data}
+from json_io import dumps_json, load_json, save_json
 
-    with open("data/pushjerk_cycles_names.json", "w") as f:
-        f.write(json.dumps(names, indent=2))
+CYCLES_FILE = "data/pushjerk_cycles.json"
+NAMES_FILE = "data/pushjerk_cycles_names.json"
 
 
-def restore_cycles():
-    with open("data/pushjerk_cycles.json", "r") as f:
-        data = json.load(f)
+def backup_cycles():
+    # Stream the cycles, only their ids and names are needed
+    with open(CYCLES_FILE, "rb") as f:
+        names = {}
+        for cycle in json_stream.load(f):
+            d = {key: value for key, value in cycle.items() if key in ("cycle_id", "name")}
+            names[d["cycle_id"]] = d["name"]
 
-    with open("data/pushjerk_cycles_names.json", "r") as f:
-        names = json.load(f)
+    save_json(names, NAMES_FILE)
 
-    for d in data:
-        cycle_id = str(d["cycle_id"])
-        if cycle_id in names:
-            d["name"] = names[cycle_id]
-        else:
-            print(cycle_id, "not found in names")
 
-    with open("data/pushjerk_cycles.json", "w") as f:
-        f.write(json.dumps(data, indent=2))
+def restore_cycles():
+    names = load_json(NAMES_FILE)
+
+    # Patch the cycles one at a time into a temporary file, then swap it in
+    tmp_file = CYCLES_FILE + ".tmp"
+    with open(CYCLES_FILE, "rb") as f, open(tmp_file, "wb") as out:
+        out.write(b"[")
+        for i, cycle in enumerate(json_stream.load(f)):
+            d = json_stream.to_standard_types(cycle)
+            cycle_id = str(d["cycle_id"])
+            if cycle_id in names:
+                d["name"] = names[cycle_id]
+            else:
+                print(cycle_id, "not found in names")
+            if i:
+                out.write(b",")
+            out.write(dumps_json(d))
+        out.write(b"]")
+    os.replace(tmp_file, CYCLES_FILE)
@@ -0,0 +1,44 @@
+# json read/write, using orjson when it is installed
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    """Load a JSON file"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dumps_json(obj):
+    """Serialize obj to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def save_json(obj, path, indent=True):
+    """Save obj to a JSON file, indented with 2 spaces or compact
+
+    The file is written next to path and then renamed over it, so an interrupted
+    save never leaves a truncated file behind.
+    """
+    tmp_path = path + ".tmp"
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(obj, option=option))
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if indent:
+                json.dump(obj, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(obj, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,29 @@
+# raw page html storage
+import gzip
+import os
+
+PAGES_DIR = os.path.join("data", "pages")
+
+
+def page_path(page_num):
+    """Path of the gzip file holding the HTML of a page"""
+    return os.path.join(PAGES_DIR, f"page_{page_num}.html.gz")
+
+
+def write_page_html(page_num, html):
+    """Write the HTML of a page to its own gzip file and return the path"""
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    path = page_path(page_num)
+    # Write then rename, so readers never see a partial file
+    with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def read_page_html(page_data):
+    """Read the HTML of a page (older scrapes embedded it in the page entry)"""
+    if "html" in page_data:
+        return page_data["html"]
+    with gzip.open(page_data["path"], "rt", encoding="utf-8") as f:
+        return f.read()
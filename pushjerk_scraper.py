@@ -1,109 +1,236 @@
-import json
+import functools
 import os
+import random
 import re
 import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
+import json_stream
 import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from tqdm import tqdm
 
+from json_io import load_json, save_json
+from page_store import page_path, write_page_html
+
+WORKOUTS_FILE = os.path.join("data", "pushjerk_workouts.json")
+
+# Characters of post text kept per workout (the full text is rebuilt by reprocess_data.py)
+CONTENT_PREVIEW_CHARS = 2048
+
+# Workout fields needed by the incremental update, read without loading the whole file
+STREAMED_WORKOUT_FIELDS = {"title", "cycle_id", "week_number", "source_page", "exercise_links"}
+
+# Returned by get_page when a conditional request gets 304 Not Modified
+NOT_MODIFIED = object()
+
+# Selectors for blog posts/articles, in order of preference
+POST_SELECTORS = [
+    "article",
+    ".post",
+    ".entry",
+    ".workout-post",
+    '[class*="post"]',
+    ".hentry",
+]
+
+# Link keywords that suggest an exercise
+EXERCISE_KEYWORDS = [
+    "squat",
+    "deadlift",
+    "pullup",
+    "pull-up",
+    "pushup",
+    "push-up",
+    "burpee",
+    "thruster",
+    "clean",
+    "jerk",
+    "snatch",
+    "row",
+    "kettlebell",
+    "kb",
+    "box jump",
+    "wall ball",
+    "double under",
+    "handstand",
+    "muscle up",
+    "toes to bar",
+    "sit-up",
+    "plank",
+    "lunge",
+    "press",
+    "curl",
+    "swing",
+    "turkish get up",
+    "farmer",
+]
+DEMO_KEYWORDS = ["demo", "video", "how to", "tutorial", "form"]
+VIDEO_HOSTS = ["youtube.com", "youtu.be"]
+
+
+def _keywords_re(keywords):
+    """Compile keywords into a single case-insensitive alternation"""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+_TEXT_KEYWORDS_RE = _keywords_re(EXERCISE_KEYWORDS + DEMO_KEYWORDS)
+_HREF_KEYWORDS_RE = _keywords_re(EXERCISE_KEYWORDS + VIDEO_HOSTS)
+_WEEK_RE = re.compile(r"Week\s+(\d+)\s+of\s+(\d+)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=8192)
+def join_url(base_url, href):
+    """Resolve a link against the site URL (most hrefs repeat across pages)"""
+    if href.startswith(("http://", "https://")):
+        return href
+    return urljoin(base_url, href)
+
 
 class PushJerkScraper:
     def __init__(self, base_url="https://pushjerk.com"):
         self.base_url = base_url
+        # requests already asks for compressed responses (adding br when brotli is installed)
+        # and decodes them, so pages are handed to the parser as bytes straight from .content
         self.session = requests.Session()
         self.session.headers.update(
             {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
         )
-        self.workouts = []
+        self.workouts = deque()
         self.cycles = []
         self.current_cycle = None
         self.current_week = None
         self.raw_pages = []
-
-    def get_page(self, url, delay=1):
-        """Fetch a page with error handling and rate limiting"""
+        self._validators = {}  # url -> ETag / Last-Modified of the last response
+        # File writes run here so they overlap with fetching the next page
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        self._pending_writes = []
+        # HTML of pages fetched by an update, only written once the update keeps them
+        self._fetched_html = {}
+        self._title_index = set()  # Titles of all stored workouts, for duplicate checks
+
+    def get_page(self, url, delay=1, cached_page=None):
+        """Fetch a page with error handling and rate limiting
+
+        If cached_page (a stored raw page) has an ETag or Last-Modified, the request is
+        conditional and NOT_MODIFIED is returned when the page hasn't changed.
+        """
+        headers = {}
+        if cached_page:
+            if cached_page.get("etag"):
+                headers["If-None-Match"] = cached_page["etag"]
+            if cached_page.get("last_modified"):
+                headers["If-Modified-Since"] = cached_page["last_modified"]
         try:
             time.sleep(delay)
             # print(f"Fetching: {url}")
-            response = self.session.get(url)
+            response = self.session.get(url, headers=headers)
+            if response.status_code == 304:
+                return NOT_MODIFIED
             response.raise_for_status()
-            return BeautifulSoup(response.content, "html.parser")
+            self._validators[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            return LexborHTMLParser(response.content)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching {url}: {e}")
             return None
 
-    def store_page_html(self, soup, page_num, url):
-        """Store complete page HTML for later processing"""
-        page_data = {
+    def write_page(self, page_num, html):
+        """Start writing the HTML of a page to its file"""
+        self._pending_writes.append(self._io_pool.submit(write_page_html, page_num, html))
+
+    def page_record(self, page_num, url, post_count):
+        """Raw page entry of a page, pointing to its HTML file"""
+        return {
             "page_number": page_num,
             "url": url,
-            "html": str(soup),
+            "path": page_path(page_num),
             "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "post_count": len(soup.select('article, .post, .entry, [class*="post"]')),
+            "post_count": post_count,
+            **self._validators.get(url, {}),
         }
+
+    def store_page_html(self, tree, page_num, url, post_count):
+        """Store complete page HTML for later processing"""
+        self.write_page(page_num, tree.html)
+        page_data = self.page_record(page_num, url, post_count)
         self.raw_pages.append(page_data)
         # print(f"Stored HTML for page {page_num} ({page_data['post_count']} posts found)")
 
+    def _iter_workouts(self):
+        """Stream stored workouts one at a time, keeping only the fields used for updates"""
+        if not os.path.exists(WORKOUTS_FILE):
+            return
+        with open(WORKOUTS_FILE, "rb") as f:
+            for workout in json_stream.load(f):
+                yield {
+                    key: json_stream.to_standard_types(value)
+                    for key, value in workout.items()
+                    if key in STREAMED_WORKOUT_FIELDS
+                }
+
+    def _load_stored_workouts(self):
+        """Load the full stored workouts list"""
+        if os.path.exists(WORKOUTS_FILE):
+            return load_json(WORKOUTS_FILE)
+        return []
+
     def load_existing_data(self):
-        """Load existing data from JSON files"""
+        """Load existing cycles and pages, and restore the cycle state from stored workouts"""
         try:
-            # Load existing workouts
-            workouts_file = os.path.join("data", "pushjerk_workouts.json")
-            if os.path.exists(workouts_file):
-                with open(workouts_file, "r", encoding="utf-8") as f:
-                    self.workouts = json.load(f)
-
             # Load existing cycles
             cycles_file = os.path.join("data", "pushjerk_cycles.json")
             if os.path.exists(cycles_file):
-                with open(cycles_file, "r", encoding="utf-8") as f:
-                    self.cycles = json.load(f)
+                self.cycles = load_json(cycles_file)
 
             # Load raw pages
             html_file = os.path.join("data", "pushjerk_raw_pages.json")
             if os.path.exists(html_file):
-                with open(html_file, "r", encoding="utf-8") as f:
-                    self.raw_pages = json.load(f)
+                self.raw_pages = load_json(html_file)
+
+            # Stream workouts to restore current cycle state; the full list is only
+            # loaded by merge_new_data when there are new workouts to add
+            workout_count = 0
+            cycle_weeks = []
+            current_cycle_id = self.cycles[-1]["cycle_id"] if self.cycles else None
+            for workout in self._iter_workouts():
+                workout_count += 1
+                self._index_title(workout)
+                if current_cycle_id is not None and workout.get("cycle_id") == current_cycle_id:
+                    if workout.get("week_number"):
+                        cycle_weeks.append(workout["week_number"])
 
-            # Restore current cycle state
             if self.cycles:
                 self.current_cycle = self.cycles[-1]  # Most recent cycle
-                # Find latest week number
-                cycle_workouts = [
-                    w for w in self.workouts if w.get("cycle_id") == self.current_cycle["cycle_id"]
-                ]
-                if cycle_workouts:
-                    self.current_week = max(
-                        w.get("week_number", 0) for w in cycle_workouts if w.get("week_number")
-                    )
+                if cycle_weeks:
+                    self.current_week = max(cycle_weeks)
 
-            print(f"Loaded existing data: {len(self.workouts)} workouts, {len(self.cycles)} cycles")
+            print(f"Loaded existing data: {workout_count} workouts, {len(self.cycles)} cycles")
             return True
         except Exception as e:
             print(f"Error loading existing data: {e}")
             return False
 
-    def get_latest_workout_titles(self):
-        """Get titles of most recent workouts to check for duplicates"""
-        if not self.workouts:
-            return set()
-        # Get titles from first page worth of workouts
-        recent_titles = set()
-        page_1_workouts = [w for w in self.workouts if w.get("source_page") == 1]
-        for workout in page_1_workouts:
-            if workout.get("title"):
-                recent_titles.add(workout["title"].strip())
-        return recent_titles
+    def _index_title(self, workout):
+        """Add the title of a workout to the duplicate-check index"""
+        if not workout.get("title"):
+            return
+        self._title_index.add(workout["title"].strip())
+
+    def is_existing_title(self, title):
+        """Check if a scraped workout title is already stored"""
+        return title in self._title_index
 
     def update_with_new_workouts(self, max_pages=3):
         """Download only new workouts from recent pages"""
-        existing_titles = self.get_latest_workout_titles()
         new_workouts = []
         new_pages = []
 
-        print(f"Checking for new workouts... (existing titles: {len(existing_titles)})")
+        print(f"Checking for new workouts... (existing titles: {len(self._title_index)})")
 
         for page_num in range(1, max_pages + 1):
             if page_num == 1:
@@ -111,26 +238,29 @@ class PushJerkScraper:
             else:
                 url = f"{self.base_url}/page/{page_num}/"
 
-            soup = self.get_page(url)
-            if soup:
-                # Store raw HTML
-                page_data = {
-                    "page_number": page_num,
-                    "url": url,
-                    "html": str(soup),
-                    "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "post_count": len(soup.select('article, .post, .entry, [class*="post"]')),
-                }
-
+            cached_page = next(
+                (p for p in self.raw_pages if p["page_number"] == page_num and p["url"] == url),
+                None,
+            )
+            tree = self.get_page(url, cached_page=cached_page)
+            if tree is NOT_MODIFIED:
+                # Nothing new was posted, so later pages haven't changed either
+                print(f"Page {page_num} not modified, stopping search")
+                break
+            if tree:
                 # Extract workouts from this page
-                page_workouts = self.extract_workout_posts(soup)
+                page_workouts, post_count = self.extract_workout_posts(tree)
+
+                # Keep the raw HTML, it is only written if the page ends up merged
+                page_data = self.page_record(page_num, url, post_count)
+                self._fetched_html[page_num] = tree.html
                 new_workouts_found = 0
 
                 for workout_data in page_workouts:
                     workout_title = workout_data.get("title", "").strip()
 
                     # Check if this is a new workout
-                    if workout_title not in existing_titles:
+                    if not self.is_existing_title(workout_title):
                         workout_data["source_page"] = page_num
                         workout_data["source_url"] = url
                         new_workouts.append(workout_data)
@@ -160,6 +290,9 @@ class PushJerkScraper:
         """Merge new workouts and pages with existing data"""
         # Add new pages
         for page_data in new_pages:
+            self.write_page(
+                page_data["page_number"], self._fetched_html.pop(page_data["page_number"])
+            )
             # Remove any existing data for this page number
             self.raw_pages = [
                 p for p in self.raw_pages if p["page_number"] != page_data["page_number"]
@@ -167,29 +300,25 @@ class PushJerkScraper:
             self.raw_pages.append(page_data)
 
         # Add new workouts to the beginning (most recent first)
-        self.workouts = new_workouts + self.workouts
+        if not self.workouts:
+            self.workouts = deque(self._load_stored_workouts())
+        self.workouts.extendleft(reversed(new_workouts))
+        for workout in new_workouts:
+            self._index_title(workout)
 
         print(f"Merged {len(new_workouts)} new workouts and {len(new_pages)} updated pages")
 
-    def extract_workout_posts(self, soup):
-        """Extract workout posts from a page"""
+    def extract_workout_posts(self, tree):
+        """Extract workout posts from a page, returns them with the number of posts found"""
         workouts = []
 
-        # Common selectors for blog posts/articles
-        post_selectors = [
-            "article",
-            ".post",
-            ".entry",
-            ".workout-post",
-            '[class*="post"]',
-            ".hentry",
-        ]
-
+        # Posts are the nodes of the first selector that finds any. The first one, article,
+        # normally does, so the page is usually queried once. The count of these posts is
+        # the page's post_count
         posts = []
-        for selector in post_selectors:
-            found_posts = soup.select(selector)
-            if found_posts:
-                posts = found_posts
+        for selector in POST_SELECTORS:
+            posts = tree.css(selector)
+            if posts:
                 # print(f"Found {len(posts)} posts using selector: {selector}")
                 break
 
@@ -198,16 +327,15 @@ class PushJerkScraper:
             if workout_data:
                 workouts.append(workout_data)
 
-        return workouts
+        return workouts, len(posts)
 
     def extract_workout_data(self, post_element):
         """Extract data from a single workout post"""
         workout = {
             "title": "",
-            "content": "",
+            "content_preview": "",
             "exercise_links": [],
             "all_links": [],
-            "raw_html": str(post_element),
         }
 
         # Extract title
@@ -221,32 +349,30 @@ class PushJerkScraper:
             "header h2",
         ]
         for selector in title_selectors:
-            title_elem = post_element.select_one(selector)
+            title_elem = post_element.css_first(selector)
             if title_elem:
-                title_text = title_elem.get_text().strip()
+                title_text = title_elem.text(deep=True).strip()
                 workout["title"] = title_text
                 break
 
-        # If no title found, look in parent elements
+        # If no title found, look for a header title in the parent element (any h1 in
+        # the parent would usually be the site title)
         if not workout["title"]:
             parent = post_element.parent
             if parent:
-                for selector in title_selectors:
-                    title_elem = parent.select_one(selector)
-                    if title_elem:
-                        title_text = title_elem.get_text().strip()
-                        workout["title"] = title_text
-                        break
+                title_elem = parent.css_first("header h1, header h2")
+                if title_elem:
+                    workout["title"] = title_elem.text(deep=True).strip()
 
-        # Extract content text
-        workout["content"] = post_element.get_text().strip()
+        # Keep only the start of the content text, where cycle info is given
+        workout["content_preview"] = post_element.text(deep=True).strip()[:CONTENT_PREVIEW_CHARS]
 
         # Extract all links
-        links = post_element.find_all("a", href=True)
+        links = post_element.css("a[href]")
         for link in links:
-            href = link["href"]
-            full_url = urljoin(self.base_url, href)
-            link_text = link.get_text().strip()
+            href = link.attributes.get("href") or ""
+            full_url = join_url(self.base_url, href)
+            link_text = link.text(deep=True).strip()
 
             link_data = {
                 "url": full_url,
@@ -261,8 +387,9 @@ class PushJerkScraper:
                 workout["exercise_links"].append(link_data)
 
         # Detect cycle information (Monday workouts)
-        if "mon" in workout["title"].lower():
-            self.detect_cycle_info(workout["content"], workout["title"])
+        title_lower = workout["title"].lower()
+        if "mon" in title_lower:
+            self.detect_cycle_info(workout["content_preview"], workout["title"], title_lower)
 
         # Add cycle information to workout
         workout["cycle_id"] = self.current_cycle["cycle_id"] if self.current_cycle else None
@@ -273,22 +400,23 @@ class PushJerkScraper:
             else None
         )
 
-        # Add workout to current cycle
+        # The cycle's workout indices are filled in by save_data from cycle_id
         if self.current_cycle:
             if not self.current_cycle["start_date"] and workout["title"]:
                 self.current_cycle["start_date"] = workout["title"]
-            self.current_cycle["workouts"].append(len(self.workouts))
 
         if workout["title"] or workout["exercise_links"]:
             return workout
 
         return None
 
-    def detect_cycle_info(self, content_text, title):
+    def detect_cycle_info(self, content_text, title, title_lower=None):
         """Detect cycle and week information from workout content"""
+        if title_lower is None:
+            title_lower = title.lower()
+
         # Check for "Week x of y" pattern
-        week_pattern = r"Week\s+(\d+)\s+of\s+(\d+)"
-        match = re.search(week_pattern, content_text, re.IGNORECASE)
+        match = _WEEK_RE.search(content_text)
 
         if match:
             week_num = int(match.group(1))
@@ -304,10 +432,11 @@ class PushJerkScraper:
             return True
 
         # Check if it's Monday and might be start of new cycle (no "Week x of y" found)
-        if "mon" in title.lower() and not match:
+        if "mon" in title_lower and not match:
             # Look for cycle explanation keywords
             cycle_keywords = ["cycle", "program", "phase", "block", "weeks", "training"]
-            if any(keyword in content_text.lower() for keyword in cycle_keywords):
+            content_lower = content_text.lower()
+            if any(keyword in content_lower for keyword in cycle_keywords):
                 self.start_new_cycle()
                 self.current_week = 1
                 return True
@@ -328,84 +457,41 @@ class PushJerkScraper:
 
     def is_exercise_link(self, link_text, href):
         """Determine if a link is likely an exercise"""
-        # Exercise keywords
-        exercise_keywords = [
-            "squat",
-            "deadlift",
-            "pullup",
-            "pull-up",
-            "pushup",
-            "push-up",
-            "burpee",
-            "thruster",
-            "clean",
-            "jerk",
-            "snatch",
-            "row",
-            "kettlebell",
-            "kb",
-            "box jump",
-            "wall ball",
-            "double under",
-            "handstand",
-            "muscle up",
-            "toes to bar",
-            "sit-up",
-            "plank",
-            "lunge",
-            "press",
-            "curl",
-            "swing",
-            "turkish get up",
-            "farmer",
-        ]
-
-        text_lower = link_text.lower()
-        href_lower = href.lower()
+        # Exercise keywords in the link text or URL, YouTube URLs (often exercise demos),
+        # or video/demo wording in the link text
+        return bool(_TEXT_KEYWORDS_RE.search(link_text) or _HREF_KEYWORDS_RE.search(href))
 
-        # Check if link text or URL contains exercise keywords
-        for keyword in exercise_keywords:
-            if keyword in text_lower or keyword in href_lower:
-                return True
-
-        # Check if it's a YouTube link (often exercise demos)
-        if "youtube.com" in href_lower or "youtu.be" in href_lower:
-            return True
-
-        # Check if it's a video or demo link
-        demo_keywords = ["demo", "video", "how to", "tutorial", "form"]
-        for keyword in demo_keywords:
-            if keyword in text_lower:
-                return True
-
-        return False
-
-    def scrape_pages(self, start_page=1, end_page=5):
-        """Scrape multiple pages"""
+    def scrape_pages(self, start_page=1, end_page=5, max_workers=4):
+        """Scrape multiple pages, fetching a few at a time over the keep-alive session"""
         print(f"Scraping pages {start_page} to {end_page}")
 
-        for page_num in tqdm(range(start_page, end_page + 1)):
-            if page_num == 1:
-                url = self.base_url
-            else:
-                url = f"{self.base_url}/page/{page_num}/"
+        page_nums = range(start_page, end_page + 1)
+        urls = [
+            self.base_url if page_num == 1 else f"{self.base_url}/page/{page_num}/"
+            for page_num in page_nums
+        ]
 
-            soup = self.get_page(url)
-            if not soup:
-                print(f"Failed to load page {page_num}")
-                continue
+        def fetch(url):
+            # Be respectful: small jittered delay per request, at most max_workers at once
+            return self.get_page(url, delay=random.uniform(0.5, 1.5))
 
-            self.store_page_html(soup, page_num, url)
-            page_workouts = self.extract_workout_posts(soup)
-            # print(f"Page {page_num}: Found {len(page_workouts)} workouts")
+        # Pages are still processed in order, cycle detection depends on it
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            trees = executor.map(fetch, urls)
+            for page_num, url, tree in tqdm(zip(page_nums, urls, trees), total=len(urls)):
+                if not tree:
+                    print(f"Failed to load page {page_num}")
+                    continue
 
-            for workout in page_workouts:
-                workout["source_page"] = page_num
-                workout["source_url"] = url
-                self.workouts.append(workout)
+                page_workouts, post_count = self.extract_workout_posts(tree)
+                self.store_page_html(tree, page_num, url, post_count)
+                # print(f"Page {page_num}: Found {len(page_workouts)} workouts")
 
-            # Be respectful with delays
-            time.sleep(2)
+                for workout in page_workouts:
+                    workout["source_page"] = page_num
+                    workout["source_url"] = url
+                    self.workouts.append(workout)
+                    self._index_title(workout)
 
         print(f"Total workouts scraped: {len(self.workouts)}")
 
@@ -423,8 +509,11 @@ class PushJerkScraper:
 
             # Re-process cycles for new workouts
             for workout in new_workouts:
-                if "mon" in workout["title"].lower():
-                    self.detect_cycle_info(workout["content"], workout["title"])
+                title_lower = workout["title"].lower()
+                if "mon" in title_lower:
+                    self.detect_cycle_info(
+                        workout["content_preview"], workout["title"], title_lower
+                    )
 
             self.save_data()
             print("Database updated successfully!")
@@ -438,49 +527,65 @@ class PushJerkScraper:
         if not os.path.exists("data"):
             os.makedirs("data")
 
-        # Save raw HTML pages
-        html_file = os.path.join("data", "pushjerk_raw_pages.json")
-        with open(html_file, "w", encoding="utf-8") as f:
-            json.dump(self.raw_pages, f, indent=2, ensure_ascii=False)
-        print(f"Saved {len(self.raw_pages)} raw pages to {html_file}")
+        # Page files must be on disk before the pages that point to them are saved
+        for future in self._pending_writes:
+            future.result()
+        self._pending_writes = []
 
-        # Save processed workouts
-        workouts_file = os.path.join("data", "pushjerk_workouts.json")
-        with open(workouts_file, "w", encoding="utf-8") as f:
-            json.dump(self.workouts, f, indent=2, ensure_ascii=False)
-        print(f"Saved {len(self.workouts)} workouts to {workouts_file}")
+        # Cycles are saved with the indices of their workouts in the saved list
+        cycle_workouts = defaultdict(list)
+        for i, workout in enumerate(self.workouts):
+            cycle_workouts[workout.get("cycle_id")].append(i)
+        for cycle in self.cycles:
+            cycle["workouts"] = cycle_workouts[cycle["cycle_id"]]
 
-        # Save cycles
-        cycles_file = os.path.join("data", "pushjerk_cycles.json")
-        with open(cycles_file, "w", encoding="utf-8") as f:
-            json.dump(self.cycles, f, indent=2, ensure_ascii=False)
-        print(f"Saved {len(self.cycles)} cycles to {cycles_file}")
+        # Database summary
+        min_page, max_page = float("inf"), -1
+        for page_data in self.raw_pages:
+            min_page = min(min_page, page_data["page_number"])
+            max_page = max(max_page, page_data["page_number"])
 
-        # Save database summary
         db_summary = {
             "last_updated": time.strftime("%Y-%m-%d %H:%M:%S"),
             "total_pages": len(self.raw_pages),
             "total_workouts": len(self.workouts),
             "total_cycles": len(self.cycles),
-            "page_range": f"{min(p['page_number'] for p in self.raw_pages)}-{max(p['page_number'] for p in self.raw_pages)}"
-            if self.raw_pages
-            else "None",
+            "page_range": f"{min_page}-{max_page}" if self.raw_pages else "None",
         }
 
+        # Write all files concurrently; only the summary is meant for humans, the rest
+        # are saved compact
+        html_file = os.path.join("data", "pushjerk_raw_pages.json")
+        cycles_file = os.path.join("data", "pushjerk_cycles.json")
         summary_file = os.path.join("data", "database_summary.json")
-        with open(summary_file, "w", encoding="utf-8") as f:
-            json.dump(db_summary, f, indent=2, ensure_ascii=False)
+        writes = [
+            self._io_pool.submit(save_json, self.raw_pages, html_file, indent=False),
+            self._io_pool.submit(save_json, list(self.workouts), WORKOUTS_FILE, indent=False),
+            self._io_pool.submit(save_json, self.cycles, cycles_file, indent=False),
+            self._io_pool.submit(save_json, db_summary, summary_file),
+        ]
+        for future in writes:
+            future.result()
+
+        print(f"Saved {len(self.raw_pages)} raw pages to {html_file}")
+        print(f"Saved {len(self.workouts)} workouts to {WORKOUTS_FILE}")
+        print(f"Saved {len(self.cycles)} cycles to {cycles_file}")
         print(f"Saved database summary to {summary_file}")
 
     def print_summary(self):
         """Print scraping summary"""
         print("\n=== Scraping Summary ===")
         print(f"Pages scraped: {len(self.raw_pages)}")
-        print(f"Total workouts: {len(self.workouts)}")
+        # Count in one pass, streaming the stored workouts if they weren't loaded
+        total_workouts = 0
+        workouts_with_links = 0
+        for workout in self.workouts or self._iter_workouts():
+            total_workouts += 1
+            if workout.get("exercise_links"):
+                workouts_with_links += 1
+        print(f"Total workouts: {total_workouts}")
         print(f"Training cycles found: {len(self.cycles)}")
-        print(
-            f"Workouts with exercise links: {len([w for w in self.workouts if w['exercise_links']])}"
-        )
+        print(f"Workouts with exercise links: {workouts_with_links}")
 
         if self.cycles:
             for cycle in self.cycles:
@@ -1,11 +1,39 @@
-import json
+import functools
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-from bs4 import BeautifulSoup
+import json_stream
+from selectolax.lexbor import LexborHTMLParser
 from tqdm import tqdm
 
 from backup_names import restore_cycles
+from json_io import save_json
+from page_store import read_page_html
+from workout_html import build_cleaned_cache
+
+# Date in a workout title (Mon, Feb 24, 2025)
+_DATE_RE = re.compile(r"\b(mon|tue|wed|thu|fri|sat|sun),?\s+\w+\s+\d+,\s+\d{4}\b", re.IGNORECASE)
+
+# Page text split at each workout date, into the date and the text up to the next one
+_SPLIT_RE = re.compile(
+    r"(?P<date>(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),?\s+\w+\s+\d+,\s+\d{4})(?P<body>.*?)(?=(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),?\s+\w+\s+\d+,\s+\d{4}|$)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Position of each day in the week
+_DAY_IDX = {day: i for i, day in enumerate(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])}
+
+_WEEK_PATTERNS = [
+    re.compile(p)
+    for p in (
+        r"week\s+(\d+)\s+of\s+(\d+)",  # Week X of Y
+        r"week\s+(\d+)\/(\d+)",  # Week X/Y
+        r"(\d+)\.1\)",  # (program W.D) D=1 on Mondays
+        r"week\s+(\d+)(?!\s+(?:of|/))",  # Week N (not followed by "of" or "/")
+    )
+]
 
 
 def extract_workout_preview(workout_content) -> str:
@@ -58,87 +86,155 @@ def extract_workout_preview(workout_content) -> str:
     return preview
 
 
-class DataReprocessor:
-    def __init__(self):
-        self.workouts = []
-        self.cycles = []
-        self.current_cycle = None
-        self.current_week = None
-        self.raw_pages = []
+@functools.lru_cache(maxsize=4096)
+def has_workout_date(title):
+    """Whether a title contains a workout date, cached as pages overlap and repeat titles"""
+    return bool(_DATE_RE.search(title))
 
-    def load_raw_pages(self):
-        """Load the raw HTML pages"""
-        html_file = os.path.join("data", "pushjerk_raw_pages.json")
-        if os.path.exists(html_file):
-            with open(html_file, "r", encoding="utf-8") as f:
-                self.raw_pages = json.load(f)
-            print(f"Loaded {len(self.raw_pages)} raw pages")
-        else:
-            print("No raw pages found!")
 
-    def is_valid_workout_title(self, title):
-        """Check if title is a valid workout date"""
-        if not title or title.strip() in ["No title", "Warm-up", ""]:
-            print(title)
-            return False
-
-        # Check for date pattern (Mon, Feb 24, 2025)
-        date_pattern = r"\b(mon|tue|wed|thu|fri|sat|sun),?\s+\w+\s+\d+,\s+\d{4}\b"
-        res = bool(re.search(date_pattern, title.lower()))
-        if not res:
-            print(title, "is not a valid workout title")
-        return res
-
-    def get_day_from_title(self, title):
-        """Extract day of week from title"""
-        days = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-        title_lower = title.lower()
-        for day in days:
-            if title_lower.startswith(day):
-                return day
+def split_weeks(workout_indices, day_indices, titles):
+    """Split a cycle's workouts into weeks, starting a new week when the day goes back"""
+    weeks = []
+    current_week_workouts = []
+    last_day_index = -1
+    seen_dates_in_cycle = set()  # Track dates across entire cycle to avoid duplicates
+
+    for workout_index in workout_indices:
+        current_day_index = day_indices[workout_index]
+        date = titles[workout_index]
+
+        if current_day_index is None:
+            continue
+
+        # Skip if we've already seen this exact date in this cycle
+        if date and date in seen_dates_in_cycle:
+            print(f"Skipping duplicate date: {date}")  # Debug info
+            continue
+
+        # Add the date to our seen set
+        if date:
+            seen_dates_in_cycle.add(date)
+
+        # Start a new week if current day comes before the last processed day
+        # BUT only if we actually have workouts in the current week
+        should_start_new_week = current_week_workouts and current_day_index <= last_day_index
+
+        if should_start_new_week:
+            weeks.append(current_week_workouts)
+            current_week_workouts = []
+            last_day_index = -1
+
+        current_week_workouts.append(workout_index)
+        last_day_index = current_day_index
+
+    # Add the final week
+    if current_week_workouts:
+        weeks.append(current_week_workouts)
+
+    return weeks
+
+
+def is_valid_workout_title(title):
+    """Check if title is a valid workout date"""
+    if not title or title.strip() in ["No title", "Warm-up", ""]:
+        print(title)
+        return False
+
+    # Check for date pattern (Mon, Feb 24, 2025)
+    res = has_workout_date(title)
+    if not res:
+        print(title, "is not a valid workout title")
+    return res
+
+
+def get_day_from_title(title):
+    """Extract day of week from title"""
+    day = title[:3].lower()
+    return day if day in _DAY_IDX else None
+
+
+def build_workout(title, text, source_page):
+    """Build an individual workout from its title and page text"""
+    # The content is the title followed by the workout text
+    content = (title + text).strip()
+    html = f"<div><h2>{title}</h2><p>{text}</p></div>"
+    title = title.strip() or "No title"
+
+    # Skip if not a valid workout title
+    if not is_valid_workout_title(title):
         return None
 
-    def parse_workout_from_html(self, workout_html, source_page):
-        """Parse individual workout from HTML"""
-        soup = BeautifulSoup(workout_html, "html.parser")
+    preview = extract_workout_preview(content)
+
+    workout = {
+        "title": title,
+        "content": content,
+        "html": html,
+        "source_page": source_page,
+        "day": get_day_from_title(title),
+        "preview": preview,
+    }
+
+    return workout
+
+
+def parse_page(page_data):
+    """Parse the valid workouts of a raw page, oldest first"""
+    page_num = page_data["page_number"]
+    html_content = read_page_html(page_data)
+
+    # Parse the page HTML, dropping scripts and styles as they are not page text
+    tree = LexborHTMLParser(html_content)
+    tree.strip_tags(["script", "style", "template"])
+
+    # Find all text elements and look for workout patterns
+    all_text = tree.root.text()
+
+    all_workouts = []
+
+    # Look for date patterns to split content
+    for match in _SPLIT_RE.finditer(all_text):
+        text = match.group()
+        # The title is the first line, or what comes before " - "
+        sep = " - " if " - " in match["body"] else "\n"
+        title = text.partition(sep)[0]
+        workout = build_workout(title, text, page_num)
 
-        # Extract title
-        title_elem = soup.find("h2") or soup.find("h3") or soup.find("strong")
-        title = title_elem.get_text().strip() if title_elem else "No title"
+        if workout:  # Only add valid workouts
+            all_workouts.append(workout)
 
-        # Skip if not a valid workout title
-        if not self.is_valid_workout_title(title):
-            return None
+    # REVERSE the order to get chronological (oldest first)
+    all_workouts.reverse()
+    return all_workouts
 
-        # Extract content
-        content = soup.get_text().strip()
-        preview = extract_workout_preview(content)
 
-        workout = {
-            "title": title,
-            "content": content,
-            "html": workout_html,
-            "source_page": source_page,
-            "day": self.get_day_from_title(title),
-            "preview": preview,
-        }
+class DataReprocessor:
+    def __init__(self):
+        self.workouts = []
+        # Day position and title of each workout, by index, for organizing the weeks
+        self._day_indices = []
+        self._titles = []
+        self.cycles = []
+        self.current_cycle = None
+        self.current_week = None
 
-        return workout
+    def iter_raw_pages(self):
+        """Stream the raw page entries, one at a time"""
+        html_file = os.path.join("data", "pushjerk_raw_pages.json")
+        if not os.path.exists(html_file):
+            print("No raw pages found!")
+            return
+        with open(html_file, "rb") as f:
+            for page_data in json_stream.load(f):
+                yield json_stream.to_standard_types(page_data)
 
     def detect_cycle_info(self, content, title):
         """Detect cycle information from Monday workouts"""
         content_lower = content.lower()
 
-        week_patterns = [
-            r"week\s+(\d+)\s+of\s+(\d+)",  # Week X of Y
-            r"week\s+(\d+)\/(\d+)",  # Week X/Y
-            r"(\d+)\.1\)",  # (program W.D) D=1 on Mondays
-            r"week\s+(\d+)(?!\s+(?:of|/))",  # Week N (not followed by "of" or "/")
-        ]
-
         no_pattern = True
-        for pattern in week_patterns:
-            match = re.search(pattern, content_lower)
+        for pattern in _WEEK_PATTERNS:
+            match = pattern.search(content_lower)
             if match:
                 current_week = int(match.group(1))
 
@@ -175,117 +271,60 @@ class DataReprocessor:
 
     def organize_workouts_by_weeks(self):
         """Organize workouts into weeks based on day sequence, handling gaps and avoiding repeated days"""
-        day_order = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-
         for cycle in self.cycles:
             if not cycle["workouts"]:
                 continue
 
-            weeks = []
-            current_week_workouts = []
-            last_day_index = -1
-            seen_dates_in_cycle = set()  # Track dates across entire cycle to avoid duplicates
-
-            for workout_index in cycle["workouts"]:
-                if workout_index >= len(self.workouts):
-                    continue
-
-                workout = self.workouts[workout_index]
-                day = workout.get("day")
-                date = workout.get("title")
-
-                if day not in day_order:
-                    continue
-
-                # Skip if we've already seen this exact date in this cycle
-                if date and date in seen_dates_in_cycle:
-                    print(f"Skipping duplicate date: {date}")  # Debug info
-                    continue
-
-                # Add the date to our seen set
-                if date:
-                    seen_dates_in_cycle.add(date)
-
-                current_day_index = day_order.index(day)
-
-                # Start a new week if current day comes before the last processed day
-                # BUT only if we actually have workouts in the current week
-                should_start_new_week = (
-                    current_week_workouts and current_day_index <= last_day_index
-                )
-
-                if should_start_new_week:
-                    weeks.append(
-                        {"week_number": len(weeks) + 1, "workouts": current_week_workouts.copy()}
-                    )
-                    current_week_workouts = []
-                    last_day_index = -1
-
-                current_week_workouts.append(workout_index)
-                last_day_index = current_day_index
-
-            # Add the final week
-            if current_week_workouts:
-                weeks.append(
-                    {"week_number": len(weeks) + 1, "workouts": current_week_workouts.copy()}
-                )
-
-            cycle["weeks"] = weeks
+            workout_indices = [i for i in cycle["workouts"] if i < len(self.workouts)]
+            weeks = split_weeks(workout_indices, self._day_indices, self._titles)
+            cycle["weeks"] = [
+                {"week_number": i, "workouts": week_workouts}
+                for i, week_workouts in enumerate(weeks, start=1)
+            ]
 
     def reprocess_all_data(self):
         """Reprocess all workouts from raw HTML pages"""
+        # Pages are saved newest first, so they have to be collected to go oldest first.
+        # The entries only point to the page files, the HTML is read one page at a time
+        raw_pages = list(self.iter_raw_pages())
+        if raw_pages:
+            print(f"Loaded {len(raw_pages)} raw pages")
         print("Starting reprocessing...")
 
-        for page_data in tqdm(self.raw_pages[::-1]):
-            page_num = page_data["page_number"]
-            html_content = page_data["html"]
-
-            # Parse the page HTML
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # Find all text elements and look for workout patterns
-            all_text = soup.get_text()
-
-            all_workouts = []
-
-            # Look for date patterns to split content
-            date_pattern = r"((?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),?\s+\w+\s+\d+,\s+\d{4}.*?)(?=(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),?\s+\w+\s+\d+,\s+\d{4}|$)"
-            matches = re.findall(date_pattern, all_text, re.DOTALL | re.IGNORECASE)
-
-            for match in matches:
-                # Create a simple HTML structure for each workout
-                ssplit = match.split(" - ")[0] if " - " in match else match.split("\n")[0]
-                workout_html = "<div><h2>" + ssplit + f"</h2><p>{match}</p></div>"
-                workout = self.parse_workout_from_html(workout_html, page_num)
-
-                if workout:  # Only add valid workouts
-                    all_workouts.append(workout)
-
-            # REVERSE the order to get chronological (oldest first)
-            all_workouts.reverse()
-
-            # Process each valid workout
-            for workout in all_workouts:
-                try:
-                    # Calculate workout index before appending
-                    workout_index = len(self.workouts)
-
-                    # Detect cycle info for Monday workouts
-                    if workout["day"] == "mon":
-                        self.detect_cycle_info(workout["content"], workout["title"])
-
-                    # Add workout index to current cycle
-                    if self.current_cycle:
-                        self.current_cycle["workouts"].append(workout_index)
-                        workout["cycle_id"] = self.current_cycle["cycle_id"]
-                        workout["week_number"] = self.current_week
-
-                    # Append workout
-                    self.workouts.append(workout)
-
-                except Exception as e:
-                    print(f"Error processing workout: {e}")
-                    continue
+        # Parsing is independent per page, so it runs in worker processes. parse_page is
+        # a module function, so only the page entry is sent to them and not this object.
+        # Pages come back in order, for the cycle detection below
+        with ProcessPoolExecutor() as executor:
+            parsed_pages = executor.map(parse_page, raw_pages[::-1], chunksize=4)
+
+            for all_workouts in tqdm(parsed_pages, total=len(raw_pages)):
+                # Process each valid workout
+                for workout in all_workouts:
+                    try:
+                        # Calculate workout index before appending
+                        workout_index = len(self.workouts)
+
+                        # Detect cycle info for Monday workouts
+                        if workout["day"] == "mon":
+                            self.detect_cycle_info(workout["content"], workout["title"])
+
+                        # Add workout index to current cycle
+                        if self.current_cycle:
+                            self.current_cycle["workouts"].append(workout_index)
+                            workout["cycle_id"] = self.current_cycle["cycle_id"]
+                            workout["week_number"] = self.current_week
+
+                        # Append workout, sharing one day string between all workouts as
+                        # each page comes back from the workers with its own copies
+                        if workout["day"]:
+                            workout["day"] = sys.intern(workout["day"])
+                        self.workouts.append(workout)
+                        self._day_indices.append(_DAY_IDX.get(workout["day"]))
+                        self._titles.append(workout["title"])
+
+                    except Exception as e:
+                        print(f"Error processing workout: {e}")
+                        continue
 
         # Organize workouts by weeks
         self.organize_workouts_by_weeks()
@@ -299,15 +338,14 @@ class DataReprocessor:
         # Ensure data directory exists
         os.makedirs("data", exist_ok=True)
 
+        # These files are only read back by the scripts, so they are saved compact
         # Save workouts
         workouts_file = os.path.join("data", "pushjerk_workouts.json")
-        with open(workouts_file, "w", encoding="utf-8") as f:
-            json.dump(self.workouts, f, indent=2, ensure_ascii=False)
+        save_json(self.workouts, workouts_file, indent=False)
 
         # Save cycles
         cycles_file = os.path.join("data", "pushjerk_cycles.json")
-        with open(cycles_file, "w", encoding="utf-8") as f:
-            json.dump(self.cycles, f, indent=2, ensure_ascii=False)
+        save_json(self.cycles, cycles_file, indent=False)
 
         print(f"Saved {len(self.workouts)} workouts and {len(self.cycles)} cycles")
 
@@ -323,14 +361,12 @@ class DataReprocessor:
         # First, let's see what we have before filtering
         print(f"Total cycles before filtering: {len(self.cycles)}")
 
-        # Save ALL cycles (including short ones) for random selection BEFORE filtering
-        all_cycles = self.cycles.copy()  # Keep original cycles for random selection
-
         # Create separate lists for random selection from SHORT cycles only
         all_weeks = []  # Only single weeks (from 1-week cycles)
         all_2week_sequences = []  # Only complete 2-week cycles
+        long_cycles = []  # Cycles with more than 2 weeks, the ones kept
 
-        for cycle in all_cycles:
+        for cycle in self.cycles:
             weeks = cycle.get("weeks", [])
             cycle_name = cycle.get("name", f"Cycle {cycle.get('cycle_id', 'Unknown')}")
             week_count = len(weeks)
@@ -348,24 +384,25 @@ class DataReprocessor:
 
             # Only add complete 2-week cycles to all_2week_sequences
             elif week_count == 2:
+                first, second = weeks
                 two_week_data = {
                     "cycle_name": cycle_name,
-                    "week_numbers": [weeks[0]["week_number"], weeks[1]["week_number"]],
-                    "weeks": [weeks[0], weeks[1]],
+                    "week_numbers": [first["week_number"], second["week_number"]],
+                    "weeks": [first, second],
                     "total_weeks_in_cycle": week_count,
                 }
                 all_2week_sequences.append(two_week_data)
 
+            elif week_count > 2:
+                long_cycles.append(cycle)
+
         # Now filter self.cycles to only contain cycles with more than 2 weeks
-        self.cycles = [cycle for cycle in self.cycles if len(cycle.get("weeks", [])) > 2]
+        self.cycles = long_cycles
         print(f"Cycles with 3+ weeks after filtering: {len(self.cycles)}")
 
         # Save random selections data
-        with open("data/random_weeks.json", "w") as f:
-            json.dump(all_weeks, f, indent=2)
-
-        with open("data/random_2weeks.json", "w") as f:
-            json.dump(all_2week_sequences, f, indent=2)
+        save_json(all_weeks, "data/random_weeks.json", indent=False)
+        save_json(all_2week_sequences, "data/random_2weeks.json", indent=False)
 
         print(
             f"Saved {len(all_weeks)} random weeks and {len(all_2week_sequences)} random 2-week sequences"
@@ -374,9 +411,9 @@ class DataReprocessor:
 
 def main():
     reprocessor = DataReprocessor()
-    reprocessor.load_raw_pages()
     reprocessor.reprocess_all_data()
     reprocessor.filter_cycles_by_weeks()
+    build_cleaned_cache(reprocessor.workouts)
     reprocessor.save_reprocessed_data()
     reprocessor.print_summary()
     restore_cycles()
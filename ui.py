@@ -1,14 +1,14 @@
-import json
 import os
 import random
-import re
 
 import streamlit as st
 import streamlit.components.v1 as components
-from bs4 import BeautifulSoup
 from thefuzz import process
 
 from backup_names import backup_cycles
+from json_io import load_json, save_json
+from page_store import read_page_html
+from workout_html import extract_workout_html
 
 DAYS = {
     "mon": "Monday",
@@ -20,6 +20,82 @@ DAYS = {
     "sun": "Sunday",
 }
 
+# Card around the workout HTML, with a button to copy it. It is shown in an iframe, so the
+# styles have to go inline
+WORKOUT_CARD_START = """<div id="workout-container" style="
+    position: relative;
+    background-color: #f8f9fa;
+    border: 1px solid #e9ecef;
+    border-radius: 8px;
+    padding: 20px;
+    margin: 10px 0;
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    line-height: 1.6;
+    color: #333;
+">
+    <button onclick="copyToClipboard()" style="
+        position: absolute;
+        top: 10px;
+        right: 10px;
+        background-color: #f8f9fa;
+        color: black;
+        padding: 8px 16px;
+        font-size: 16px;
+        border: none;
+        border-radius: 4px;
+        cursor: pointer;
+    ">📋</button>
+
+    <style>
+        a {
+            color: #1f77b4;
+            text-decoration: underline;
+        }
+    </style>
+"""
+WORKOUT_CARD_END = """</div>
+
+<script>
+function copyToClipboard() {
+    const el = document.getElementById('workout-container');
+    const btn = document.querySelector('button[onclick="copyToClipboard()"]');
+
+    if (!el) {
+        btn.style.backgroundColor = '#e74c3c';
+        setTimeout(() => { btn.style.backgroundColor = '#f8f9fa'; }, 1500);
+        return;
+    }
+
+    const selection = window.getSelection();
+    const range = document.createRange();
+    range.selectNodeContents(el);
+    selection.removeAllRanges();
+    selection.addRange(range);
+
+    try {
+        const successful = document.execCommand('copy');
+        if (successful) {
+            btn.style.backgroundColor = '#aaaaaa';
+        } else {
+            btn.style.backgroundColor = '#e74c3c';
+        }
+    } catch (err) {
+        btn.style.backgroundColor = '#e74c3c';
+    }
+
+    selection.removeAllRanges();
+    setTimeout(() => {
+        btn.style.backgroundColor = '#f8f9fa';
+    }, 1500);
+}
+</script>
+"""
+
+WORKOUTS_FILE = os.path.join("data", "pushjerk_workouts.json")
+CYCLES_FILE = os.path.join("data", "pushjerk_cycles.json")
+RAW_PAGES_FILE = os.path.join("data", "pushjerk_raw_pages.json")
+RANDOM_WEEKS_FILE = os.path.join("data", "random_weeks.json")
+RANDOM_2WEEKS_FILE = os.path.join("data", "random_2weeks.json")
 SESSION_FILE = "data/app_session.json"
 NOTES_FILES = {
     "cycle": "data/cycle_notes.json",
@@ -27,27 +103,113 @@ NOTES_FILES = {
 }
 
 
+@st.cache_resource(max_entries=3, show_spinner=False)
+def load_cached_json(path, mtime):
+    """Load a data file, kept across reruns until its modification time changes
+
+    The loaded data is shared rather than copied on every rerun, so edits to it (like renaming a
+    cycle) must be saved back to the file. There is about one entry per data file, so versions
+    replaced by a newer modification time are evicted.
+    """
+    return load_json(path)
+
+
+def load_data_file(path, default=None):
+    """Load a data file through the cache with its mtime, or default and None if it's missing"""
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        return default, None
+    return load_cached_json(path, mtime), mtime
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_random_weeks(path, mtime, n_workouts):
+    """Load random weeks or 2-week sequences, kept until the files change
+
+    Workout indices past the end of the workouts are dropped, so the pages can use them directly.
+    """
+    entries = load_json(path)
+    for entry in entries:
+        # A 2-week sequence holds its weeks, a random week is a week itself
+        for week_data in entry.get("weeks", [entry]):
+            week_data["workouts"] = [i for i in week_data["workouts"] if i < n_workouts]
+    return entries
+
+
+def load_random_file(path, n_workouts, default=None):
+    """Load a random weeks file through the cache, or return default if it doesn't exist"""
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        return default
+    return load_random_weeks(path, mtime, n_workouts)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_page_index(mtime):
+    """Raw pages by page number, kept until the raw pages file changes"""
+    raw_pages = load_json(RAW_PAGES_FILE)
+    # Keep the first entry if a page number repeats
+    return {page["page_number"]: page for page in reversed(raw_pages)}
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def load_cycle_weeks(cycle_id, data_version, _cycle, _workouts):
+    """Workouts of each week of a cycle by week number, kept until the data files change"""
+    weeks = {}
+    for week_data in _cycle.get("weeks") or []:
+        weeks[week_data["week_number"]] = [
+            _workouts[workout_idx]
+            for workout_idx in week_data["workouts"]
+            if workout_idx < len(_workouts)
+        ]
+    return weeks
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_cycle_options(data_version, _cycles):
+    """Cycles by their selector label, latest first, kept until the data files change"""
+    cycle_options = {}
+    for cycle in reversed(_cycles):
+        cycle_name = cycle.get("name", f"Cycle {cycle['cycle_id']}")
+        week_count = len(cycle["weeks"])
+        cycle_name = f"{cycle_name} ({week_count} weeks)"
+        cycle_options[cycle_name] = cycle
+    return cycle_options
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def load_workout_options(cycle_id, week_number, data_version, _week_workouts):
+    """Labels of a week's workouts in the workout selector, kept until the data files change"""
+    workout_options = []
+    for i, workout in enumerate(_week_workouts):
+        day = workout.get("day", f"Workout {i+1}")
+        preview = workout.get("preview", "")
+        workout_options.append(f"{DAYS[day]}: {preview}")
+        # workout_options.append(f"{DAYS[day]}")
+    return workout_options
+
+
 def load_notes(which="cycle"):
     notes_file = NOTES_FILES[which]
     if os.path.exists(notes_file):
-        with open(notes_file, "r") as f:
-            return json.load(f)
+        return load_json(notes_file)
     return {}
 
 
 def save_notes(notes, which="cycle"):
     notes_file = NOTES_FILES[which]
-    with open(notes_file, "w") as f:
-        json.dump(notes, f, indent=2)
+    save_json(notes, notes_file)
 
 
 def load_session_state():
     """Load the last session state"""
     if os.path.exists(SESSION_FILE):
         try:
-            with open(SESSION_FILE, "r") as f:
-                return json.load(f)
-        except:
+            return load_json(SESSION_FILE)
+        except (OSError, ValueError):
+            # Unreadable or corrupt file, start over
             pass
     return {
         "last_visited_type": None,
@@ -60,13 +222,20 @@ def load_session_state():
 
 def save_session_state(state):
     """Save the current session state"""
-    with open(SESSION_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    save_json(state, SESSION_FILE)
+
+
+def get_session_state():
+    """Saved session state, only read from disk once per browser session"""
+    if "saved_state" not in st.session_state:
+        st.session_state.saved_state = load_session_state()
+    return st.session_state.saved_state
 
 
 def update_current_selection(selection_type, **kwargs):
-    """Update and save current selection"""
-    state = load_session_state()
+    """Update and save current selection, merging only the changed keys into the saved file"""
+    state = get_session_state()
+    previous_state = dict(state)
     state["last_visited_type"] = selection_type
 
     if selection_type == "cycle":
@@ -77,95 +246,28 @@ def update_current_selection(selection_type, **kwargs):
     elif selection_type == "random_2week":
         state["last_random_2week_id"] = kwargs.get("two_week_id")
 
-    save_session_state(state)
-
-
-def extract_workout_html(raw_html, target_date):
-    """Extract clean HTML for a specific workout date"""
-    try:
-        soup = BeautifulSoup(raw_html, "html.parser")
-        articles = soup.find_all("article")
-
-        for article in articles:
-            entry_title = article.find("h2", class_="entry-title")
-            if entry_title:
-                title_text = entry_title.get_text().strip()
-                if target_date in title_text:
-                    entry_content = article.find("div", class_="entry-content")
-                    if entry_content:
-                        return clean_workout_html(str(entry_content))
-        return None
-    except Exception as e:
-        st.error(f"Error extracting workout HTML: {e}")
-        return None
-
-
-def convert_pounds_to_kg(match):
-    weights = match.group(1)
-    weight_parts = weights.split("/")
-    converted_parts = []
-
-    for weight in weight_parts:
-        try:
-            lb_value = float(weight.strip())
-            kg_value = round(lb_value * 0.453592 / 0.5) * 0.5
-
-            if kg_value.is_integer():
-                converted_parts.append(str(int(kg_value)))
-            else:
-                converted_parts.append(str(kg_value))
-        except ValueError:
-            converted_parts.append(weight)
-
-    return "/".join(converted_parts) + "kg"
-
-
-def clean_workout_html(html_content):
-    """Clean HTML content while preserving formatting"""
-    if not html_content:
-        return None
-
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Remove unwanted elements
-    for tag in soup(["script", "style", "meta", "link", "head", "nav", "header", "footer"]):
-        tag.decompose()
-
-    # Clean up attributes but keep href for links
-    for tag in soup.find_all():
-        if tag.name == "a":
-            attrs = dict(tag.attrs)
-            tag.attrs.clear()
-            if "href" in attrs:
-                tag["href"] = attrs["href"]
-                tag["target"] = "_blank"
-        else:
-            allowed_attrs = ["class"] if tag.name in ["strong", "em", "b", "i"] else []
-            attrs = dict(tag.attrs)
-            tag.attrs.clear()
-            for attr in allowed_attrs:
-                if attr in attrs:
-                    tag[attr] = attrs[attr]
-
-    # Remove the outer div.entry-content wrapper but keep its contents
-    if soup.find("div", class_="entry-content"):
-        content_div = soup.find("div", class_="entry-content")
-        content_html = "".join(str(child) for child in content_div.children)
-    else:
-        content_html = str(soup)
+    # Most reruns keep the same selection, only write when it changed
+    if state != previous_state:
+        # Other browser sessions save to the same file, so re-read it rather than overwrite
+        # their selections with this session's copy
+        saved_state = load_session_state()
+        saved_state.update(
+            (key, value) for key, value in state.items() if previous_state.get(key) != value
+        )
+        save_session_state(saved_state)
 
-    # Regex pattern to match weight formats like "53/35#", "45#", etc.
-    weight_pattern = r"(\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)*)#"
-    content_html = re.sub(weight_pattern, convert_pounds_to_kg, content_html)
 
-    return content_html
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_workout_html(page_data, target_date):
+    """Extract a workout's HTML from its raw page, kept across reruns per page and title"""
+    return extract_workout_html(read_page_html(page_data), target_date)
 
 
 class PushJerkUI:
     def __init__(self):
         self.workouts = []
         self.cycles = []
-        self.raw_pages = []
+        self._data_version = ()
         self.random_weeks = []
         self.random_2weeks = []
         self.load_data()
@@ -176,59 +278,59 @@ class PushJerkUI:
         """Load data from JSON files"""
         try:
             # Load workouts
-            workouts_file = os.path.join("data", "pushjerk_workouts.json")
-            if os.path.exists(workouts_file):
-                with open(workouts_file, "r", encoding="utf-8") as f:
-                    self.workouts = json.load(f)
+            self.workouts, workouts_mtime = load_data_file(WORKOUTS_FILE, self.workouts)
 
             # Load cycles (now only contains cycles with 3+ weeks)
-            cycles_file = os.path.join("data", "pushjerk_cycles.json")
-            if os.path.exists(cycles_file):
-                with open(cycles_file, "r", encoding="utf-8") as f:
-                    self.cycles = json.load(f)
+            self.cycles, cycles_mtime = load_data_file(CYCLES_FILE, self.cycles)
 
-            # Load raw pages for original HTML
-            html_file = os.path.join("data", "pushjerk_raw_pages.json")
-            if os.path.exists(html_file):
-                with open(html_file, "r", encoding="utf-8") as f:
-                    self.raw_pages = json.load(f)
+            # Anything cached from the workouts and cycles is rebuilt when they change. The
+            # modification times are the ones the data was loaded for, so a file written in
+            # between can't get the old data cached under its new version
+            self._data_version = (workouts_mtime, cycles_mtime)
 
             # Load random weeks data
-            random_weeks_file = os.path.join("data", "random_weeks.json")
-            if os.path.exists(random_weeks_file):
-                with open(random_weeks_file, "r", encoding="utf-8") as f:
-                    self.random_weeks = json.load(f)
+            n_workouts = len(self.workouts)
+            self.random_weeks = load_random_file(RANDOM_WEEKS_FILE, n_workouts, self.random_weeks)
 
             # Load random 2weeks data
-            random_2weeks_file = os.path.join("data", "random_2weeks.json")
-            if os.path.exists(random_2weeks_file):
-                with open(random_2weeks_file, "r", encoding="utf-8") as f:
-                    self.random_2weeks = json.load(f)
+            self.random_2weeks = load_random_file(
+                RANDOM_2WEEKS_FILE, n_workouts, self.random_2weeks
+            )
 
         except Exception as e:
             st.error(f"Error loading data: {e}")
 
+    @property
+    def page_by_number(self):
+        """Raw pages for original HTML by page number, only loaded once a workout is shown"""
+        try:
+            return load_page_index(os.path.getmtime(RAW_PAGES_FILE))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            st.error(f"Error loading data: {e}")
+            return {}
+
     def save_cycles(self):
         """Save updated cycles back to JSON"""
-        cycles_file = os.path.join("data", "pushjerk_cycles.json")
-        with open(cycles_file, "w", encoding="utf-8") as f:
-            json.dump(self.cycles, f, indent=2, ensure_ascii=False)
+        save_json(self.cycles, CYCLES_FILE, indent=False)
 
     def get_workout_html(self, workout):
         """Get original HTML for a specific workout"""
-        source_page = workout.get("source_page", 1)
-        page_data = None
-        for page in self.raw_pages:
-            if page["page_number"] == source_page:
-                page_data = page
-                break
+        # Precomputed by build_cleaned_cache, otherwise extracted from the raw page
+        cleaned_html = workout.get("cleaned_html")
+        if cleaned_html is not None:
+            return cleaned_html
 
+        page_data = self.page_by_number.get(workout.get("source_page", 1))
         if not page_data:
             return None
 
-        workout_title = workout.get("title", "")
-        extracted_html = extract_workout_html(page_data["html"], workout_title)
-        return extracted_html
+        try:
+            return load_workout_html(page_data, workout.get("title", ""))
+        except Exception as e:
+            st.error(f"Error extracting workout HTML: {e}")
+            return None
 
     def display_week_workouts(self, week_data):
         """Display workouts in a week with previews"""
@@ -237,18 +339,13 @@ class PushJerkUI:
         workouts_by_day = {}
 
         for workout in workouts:
-            day = workout.get("day", "unknown")
-            if day not in workouts_by_day:
-                workouts_by_day[day] = []
-            workouts_by_day[day].append(workout)
+            workouts_by_day.setdefault(workout.get("day", "unknown"), []).append(workout)
 
         # Display workouts in day order
-        for day in DAYS.keys():
-            if day in workouts_by_day:
-                day_workouts = workouts_by_day[day]
-                for workout in day_workouts:
-                    preview = workout.get("preview", "")
-                    st.write(f"**{DAYS[day]}**: {preview}")
+        for day, day_name in DAYS.items():
+            for workout in workouts_by_day.get(day, ()):
+                preview = workout.get("preview", "")
+                st.write(f"**{day_name}**: {preview}")
 
     def display_workout_content(self, workout, cycle_info=None, week_info=None):
         """Display workout content with header"""
@@ -289,76 +386,7 @@ class PushJerkUI:
             # )
 
             # Option 2: use html to add copy button
-            full_html = f"""
-            <div id="workout-container" style="
-                position: relative;
-                background-color: #f8f9fa;
-                border: 1px solid #e9ecef;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 10px 0;
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                line-height: 1.6;
-                color: #333;
-            ">
-                <button onclick="copyToClipboard()" style="
-                    position: absolute;
-                    top: 10px;
-                    right: 10px;
-                    background-color: #f8f9fa;
-                    color: black;
-                    padding: 8px 16px;
-                    font-size: 16px;
-                    border: none;
-                    border-radius: 4px;
-                    cursor: pointer;
-                ">📋</button>
-
-                <style>
-                    a {{
-                        color: #1f77b4;
-                        text-decoration: underline;
-                    }}
-                </style>
-
-                {workout_html}
-            </div>
-
-            <script>
-            function copyToClipboard() {{
-                const el = document.getElementById('workout-container');
-                const btn = document.querySelector('button[onclick="copyToClipboard()"]');
-
-                if (!el) {{
-                    btn.style.backgroundColor = '#e74c3c';
-                    setTimeout(() => {{ btn.style.backgroundColor = '#f8f9fa'; }}, 1500);
-                    return;
-                }}
-
-                const selection = window.getSelection();
-                const range = document.createRange();
-                range.selectNodeContents(el);
-                selection.removeAllRanges();
-                selection.addRange(range);
-
-                try {{
-                    const successful = document.execCommand('copy');
-                    if (successful) {{
-                        btn.style.backgroundColor = '#aaaaaa';
-                    }} else {{
-                        btn.style.backgroundColor = '#e74c3c';
-                    }}
-                }} catch (err) {{
-                    btn.style.backgroundColor = '#e74c3c';
-                }}
-
-                selection.removeAllRanges();
-                setTimeout(() => {{
-                    btn.style.backgroundColor = '#f8f9fa';
-                }}, 1500);
-            }}
-            </script>
-            """
+            full_html = WORKOUT_CARD_START + workout_html + WORKOUT_CARD_END
             components.html(full_html, height=1300, scrolling=True)
 
             # Workout notes
@@ -390,31 +418,23 @@ class PushJerkUI:
             return
 
         # Load saved state
-        saved_state = load_session_state()
+        saved_state = get_session_state()
 
         # Sidebar for cycle management
         with st.sidebar:
             st.header("Training Cycles")
 
-            # Cycle selection and editing
-            cycle_options = {}
-            for cycle in self.cycles:
-                cycle_name = cycle.get("name", f"Cycle {cycle['cycle_id']}")
-                week_count = len(cycle["weeks"])
-                cycle_name = f"{cycle_name} ({week_count} weeks)"
-                cycle_options[cycle_name] = cycle
+            # Cycle selection and editing, latest cycles first
+            cycle_options = load_cycle_options(self._data_version, self.cycles)
 
             # Try to restore last selected cycle
-            cycle_names = list(cycle_options.keys())[::-1]  # Reverse order
+            cycle_names = list(cycle_options)
             default_cycle_index = 0
             if saved_state.get("last_cycle_id") is not None:
-                try:
-                    for i, cycle_name in enumerate(cycle_names):
-                        if cycle_options[cycle_name]["cycle_id"] == saved_state["last_cycle_id"]:
-                            default_cycle_index = i
-                            break
-                except:
-                    pass
+                for i, cycle_name in enumerate(cycle_names):
+                    if cycle_options[cycle_name]["cycle_id"] == saved_state["last_cycle_id"]:
+                        default_cycle_index = i
+                        break
 
             selected_cycle_name = st.selectbox(
                 "Select Cycle:", cycle_names, index=default_cycle_index
@@ -433,10 +453,8 @@ class PushJerkUI:
                     key=f"cycle_name_{selected_cycle['cycle_id']}",
                 )
                 if st.button("Save Name", key=f"save_name_{selected_cycle['cycle_id']}"):
-                    for i, cycle in enumerate(self.cycles):
-                        if cycle["cycle_id"] == selected_cycle["cycle_id"]:
-                            self.cycles[i]["name"] = new_name
-                            break
+                    # selected_cycle is the entry in self.cycles itself
+                    selected_cycle["name"] = new_name
                     self.save_cycles()
                     backup_cycles()
                     st.success("Cycle name updated!")
@@ -455,15 +473,9 @@ class PushJerkUI:
                 st.success("Notes saved!")
 
         # Organize workouts by weeks using the cycle's week structure
-        weeks = {}
-        if "weeks" in selected_cycle and selected_cycle["weeks"]:
-            for week_data in selected_cycle["weeks"]:
-                week_num = week_data["week_number"]
-                week_workouts = []
-                for workout_idx in week_data["workouts"]:
-                    if workout_idx < len(self.workouts):
-                        week_workouts.append(self.workouts[workout_idx])
-                weeks[week_num] = week_workouts
+        weeks = load_cycle_weeks(
+            selected_cycle["cycle_id"], self._data_version, selected_cycle, self.workouts
+        )
 
         if not weeks:
             st.error("No weeks found for this cycle")
@@ -478,10 +490,7 @@ class PushJerkUI:
             # Try to restore last selected week
             default_week_index = 0
             if saved_state.get("last_week_number") in week_numbers:
-                try:
-                    default_week_index = week_numbers.index(saved_state["last_week_number"])
-                except:
-                    pass
+                default_week_index = week_numbers.index(saved_state["last_week_number"])
 
             selected_week = st.selectbox(
                 "Select Week:",
@@ -493,12 +502,9 @@ class PushJerkUI:
         with col2:
             # Workout selection
             week_workouts = weeks[selected_week]
-            workout_options = []
-            for i, workout in enumerate(week_workouts):
-                day = workout.get("day", f"Workout {i+1}")
-                preview = workout.get("preview", "")
-                workout_options.append(f"{DAYS[day]}: {preview}")
-                # workout_options.append(f"{DAYS[day]}")
+            workout_options = load_workout_options(
+                selected_cycle["cycle_id"], selected_week, self._data_version, week_workouts
+            )
 
             selected_workout_idx = st.selectbox(
                 "Select Workout:",
@@ -531,55 +537,42 @@ class PushJerkUI:
 
         # Initialize or get current random week
         if "current_random_week" not in st.session_state:
-            saved_state = load_session_state()
-            if saved_state.get("last_random_week_id") is not None:
-                try:
-                    week_id = saved_state["last_random_week_id"]
-                    if 0 <= week_id < len(self.random_weeks):
-                        st.session_state.current_random_week = self.random_weeks[week_id]
-                        st.session_state.current_random_week_id = week_id
-                    else:
-                        raise IndexError()
-                except:
-                    # Fallback to random selection
-                    week = random.choice(self.random_weeks)
-                    st.session_state.current_random_week = week
-                    st.session_state.current_random_week_id = self.random_weeks.index(week)
-            else:
-                week = random.choice(self.random_weeks)
-                st.session_state.current_random_week = week
-                st.session_state.current_random_week_id = self.random_weeks.index(week)
-
-        week = st.session_state.current_random_week
+            week_id = get_session_state().get("last_random_week_id")
+            if not (isinstance(week_id, int) and 0 <= week_id < len(self.random_weeks)):
+                # Fallback to random selection
+                week_id = random.randrange(len(self.random_weeks))
+            st.session_state.current_random_week = self.random_weeks[week_id]
+            st.session_state.current_random_week_id = week_id
+
+        # Look the week up again on every rerun, its workout indices are only checked against the
+        # workouts when the random weeks are loaded and the files may have changed since
+        week_id = st.session_state.current_random_week_id
+        if week_id >= len(self.random_weeks):
+            week_id = random.randrange(len(self.random_weeks))
+            st.session_state.current_random_week_id = week_id
+        week = st.session_state.current_random_week = self.random_weeks[week_id]
 
         col1, col2 = st.columns([3, 1])
         with col1:
             st.subheader(f"Random Week: {week['cycle_name']}")
         with col2:
             if st.button("🎲 Get Another Random Week", use_container_width=True):
-                new_week = random.choice(self.random_weeks)
-                st.session_state.current_random_week = new_week
-                st.session_state.current_random_week_id = self.random_weeks.index(new_week)
+                new_week_id = random.randrange(len(self.random_weeks))
+                st.session_state.current_random_week = self.random_weeks[new_week_id]
+                st.session_state.current_random_week_id = new_week_id
                 update_current_selection(
                     "random_week", week_id=st.session_state.current_random_week_id
                 )
                 st.rerun()
 
         # Display workouts in this week
-        week_workouts = []
-        for workout_idx in week["workouts"]:
-            if workout_idx < len(self.workouts):
-                week_workouts.append(self.workouts[workout_idx])
+        week_workouts = [self.workouts[workout_idx] for workout_idx in week["workouts"]]
 
         if week_workouts:
-            workout_options = [
-                workout.get("title", f"Workout {i+1}") for i, workout in enumerate(week_workouts)
-            ]
-
             selected_workout_idx = st.selectbox(
                 "Select Workout:",
-                range(len(workout_options)),
-                format_func=lambda x: workout_options[x],
+                range(len(week_workouts)),
+                format_func=lambda i: week_workouts[i].get("title", f"Workout {i+1}"),
             )
 
             selected_workout = week_workouts[selected_workout_idx]
@@ -603,25 +596,19 @@ class PushJerkUI:
 
         # Initialize or get current random 2 weeks
         if "current_random_2week" not in st.session_state:
-            saved_state = load_session_state()
-            if saved_state.get("last_random_2week_id") is not None:
-                try:
-                    two_week_id = saved_state["last_random_2week_id"]
-                    if 0 <= two_week_id < len(self.random_2weeks):
-                        st.session_state.current_random_2week = self.random_2weeks[two_week_id]
-                        st.session_state.current_random_2week_id = two_week_id
-                    else:
-                        raise IndexError()
-                except:
-                    two_week = random.choice(self.random_2weeks)
-                    st.session_state.current_random_2week = two_week
-                    st.session_state.current_random_2week_id = self.random_2weeks.index(two_week)
-            else:
-                two_week = random.choice(self.random_2weeks)
-                st.session_state.current_random_2week = two_week
-                st.session_state.current_random_2week_id = self.random_2weeks.index(two_week)
-
-        two_week = st.session_state.current_random_2week
+            two_week_id = get_session_state().get("last_random_2week_id")
+            if not (isinstance(two_week_id, int) and 0 <= two_week_id < len(self.random_2weeks)):
+                # Fallback to random selection
+                two_week_id = random.randrange(len(self.random_2weeks))
+            st.session_state.current_random_2week = self.random_2weeks[two_week_id]
+            st.session_state.current_random_2week_id = two_week_id
+
+        # Look the sequence up again on every rerun, like the random week
+        two_week_id = st.session_state.current_random_2week_id
+        if two_week_id >= len(self.random_2weeks):
+            two_week_id = random.randrange(len(self.random_2weeks))
+            st.session_state.current_random_2week_id = two_week_id
+        two_week = st.session_state.current_random_2week = self.random_2weeks[two_week_id]
 
         col1, col2 = st.columns([3, 1])
         with col1:
@@ -629,9 +616,9 @@ class PushJerkUI:
             st.subheader(f"Random 2 Weeks: {two_week['cycle_name']}")
         with col2:
             if st.button("🎲 Get Another Random 2 Weeks", use_container_width=True):
-                new_two_week = random.choice(self.random_2weeks)
-                st.session_state.current_random_2week = new_two_week
-                st.session_state.current_random_2week_id = self.random_2weeks.index(new_two_week)
+                new_two_week_id = random.randrange(len(self.random_2weeks))
+                st.session_state.current_random_2week = self.random_2weeks[new_two_week_id]
+                st.session_state.current_random_2week_id = new_two_week_id
                 update_current_selection(
                     "random_2week", two_week_id=st.session_state.current_random_2week_id
                 )
@@ -643,21 +630,13 @@ class PushJerkUI:
             st.subheader(f"Week {week_num}")
 
             # Get workouts for this week
-            week_workouts = []
-            for workout_idx in week_data["workouts"]:
-                if workout_idx < len(self.workouts):
-                    week_workouts.append(self.workouts[workout_idx])
+            week_workouts = [self.workouts[workout_idx] for workout_idx in week_data["workouts"]]
 
             if week_workouts:
-                workout_options = [
-                    workout.get("title", f"Workout {j+1}")
-                    for j, workout in enumerate(week_workouts)
-                ]
-
                 selected_workout_idx = st.selectbox(
                     "Select Workout:",
-                    range(len(workout_options)),
-                    format_func=lambda x: workout_options[x],
+                    range(len(week_workouts)),
+                    format_func=lambda j: week_workouts[j].get("title", f"Workout {j+1}"),
                     key=f"workout_selector_week_{week_num}",
                 )
 
@@ -698,7 +677,7 @@ class PushJerkUI:
 
         # Initialize selection type from saved state
         if "selection_type" not in st.session_state:
-            saved_state = load_session_state()
+            saved_state = get_session_state()
             st.session_state.selection_type = saved_state.get("last_visited_type", "cycle")
 
         # Selection buttons
@@ -0,0 +1,155 @@
+# workout html extraction and cleaning, shared by the UI and reprocess_data.py
+import functools
+import os
+import re
+
+import lxml.html
+from lxml import etree
+
+from json_io import load_json
+from page_store import read_page_html
+
+RAW_PAGES_FILE = os.path.join("data", "pushjerk_raw_pages.json")
+
+# Tags removed, and tags that keep their class, when cleaning the workout HTML
+UNWANTED_TAGS = ("script", "style", "meta", "link", "head", "nav", "header", "footer")
+CLASS_TAGS = frozenset(("strong", "em", "b", "i"))
+
+# Date in a workout title (Mon, Feb 24, 2025)
+DATE_RE = re.compile(
+    r"\b(?:mon|tue|wed|thu|fri|sat|sun),? \w+ \d+, \d{4}\b", re.IGNORECASE | re.ASCII
+)
+
+# Start and end tags of the articles in the page source
+_ARTICLE_START_RE = re.compile(r"<article\b", re.IGNORECASE)
+_ARTICLE_END_RE = re.compile(r"</article\s*>", re.IGNORECASE)
+
+# Weights in pounds like "53/35#", "45#", etc.
+WEIGHT_RE = re.compile(r"(\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)*)#")
+
+
+def iter_articles_containing(raw_html, text):
+    """Yield the HTML of each article whose source contains text, in page order
+
+    Tags are matched in any case, and an article without a closing tag runs up to the next one.
+    If no article contains text, the whole page is yielded instead, to be parsed in full.
+    """
+    if text:
+        starts = [match.start() for match in _ARTICLE_START_RE.finditer(raw_html)]
+        found = False
+        for i, start in enumerate(starts):
+            limit = starts[i + 1] if i + 1 < len(starts) else len(raw_html)
+            end_match = _ARTICLE_END_RE.search(raw_html, start, limit)
+            end = end_match.end() if end_match else limit
+            if raw_html.find(text, start, end) != -1:
+                found = True
+                yield raw_html[start:end]
+        if found:
+            return
+    yield raw_html
+
+
+def find_by_class(el, tag, class_name):
+    """First element under el with the given tag and class, or None"""
+    return next((match for match in el.find_class(class_name) if match.tag == tag), None)
+
+
+def extract_workout_html(raw_html, target_date):
+    """Extract clean HTML for a specific workout date, None if it isn't on the page
+
+    Parsing errors are raised, for the caller to report.
+    """
+    # Only parse the articles where the date appears, instead of the whole page. The search
+    # is on the page source, so it uses the plain ASCII date: the rest of the title may be
+    # escaped there (&amp;, &#8211;, ...). The full title is compared on the parsed text
+    date_match = DATE_RE.search(target_date)
+    search_text = date_match.group() if date_match else ""
+    for article_html in iter_articles_containing(raw_html, search_text):
+        for article in lxml.html.fromstring(article_html).iter("article"):
+            entry_title = find_by_class(article, "h2", "entry-title")
+            if entry_title is not None:
+                title_text = entry_title.text_content().strip()
+                if target_date in title_text:
+                    entry_content = find_by_class(article, "div", "entry-content")
+                    if entry_content is not None:
+                        return clean_workout_html(entry_content)
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def pounds_to_kg(weight):
+    """Convert a weight in pounds to kg, rounded to the nearest half kg"""
+    try:
+        lb_value = float(weight.strip())
+    except ValueError:
+        return weight
+    kg_value = round(lb_value * 0.453592 / 0.5) * 0.5
+
+    if kg_value.is_integer():
+        return str(int(kg_value))
+    return str(kg_value)
+
+
+def convert_pounds_to_kg(match):
+    # The same few weights come up over and over, so each one is only converted once
+    return "/".join(map(pounds_to_kg, match.group(1).split("/"))) + "kg"
+
+
+def clean_workout_html(content):
+    """Clean a parsed workout content element in place, returning its inner HTML"""
+    # Remove unwanted elements
+    etree.strip_elements(content, *UNWANTED_TAGS, with_tail=False)
+
+    # Clean up attributes but keep href for links, and convert weights to kg in the text
+    for el in content.iter():
+        if el.text and "#" in el.text:
+            el.text = WEIGHT_RE.sub(convert_pounds_to_kg, el.text)
+        if el.tail and "#" in el.tail and el is not content:
+            el.tail = WEIGHT_RE.sub(convert_pounds_to_kg, el.tail)
+        if not el.attrib:
+            continue
+        keep = "href" if el.tag == "a" else "class" if el.tag in CLASS_TAGS else None
+        for name in el.attrib.keys():
+            if name != keep:
+                del el.attrib[name]
+        if keep == "href" and "href" in el.attrib:
+            el.set("target", "_blank")
+
+    # Serialize in one go, removing the outer div.entry-content wrapper (now attribute-free)
+    # but keeping its contents
+    content_html = lxml.html.tostring(content, encoding="unicode", with_tail=False)
+    content_html = content_html[content_html.index(">") + 1 : content_html.rindex("<")]
+
+    return content_html
+
+
+def build_cleaned_cache(workouts):
+    """Store each workout's cleaned HTML in it before it's saved, so the UI needn't parse pages"""
+    if not os.path.exists(RAW_PAGES_FILE):
+        return
+
+    # Keep the first entry if a page number repeats
+    page_by_number = {page["page_number"]: page for page in reversed(load_json(RAW_PAGES_FILE))}
+
+    # Read each page once for all of its workouts
+    workouts_by_page = {}
+    for workout in workouts:
+        workouts_by_page.setdefault(workout.get("source_page", 1), []).append(workout)
+
+    n_cleaned = 0
+    for page_num, page_workouts in workouts_by_page.items():
+        page_data = page_by_number.get(page_num)
+        if not page_data:
+            continue
+        raw_html = read_page_html(page_data)
+        for workout in page_workouts:
+            try:
+                cleaned_html = extract_workout_html(raw_html, workout.get("title", ""))
+            except Exception as e:
+                print(f"Error extracting workout HTML for {workout.get('title')}: {e}")
+                continue
+            if cleaned_html is not None:
+                workout["cleaned_html"] = cleaned_html
+                n_cleaned += 1
+
+    print(f"Stored cleaned HTML for {n_cleaned} of {len(workouts)} workouts")